@@ -85,7 +85,7 @@ def vis(filnavn: str, **kwargs) -> None:
 )
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
@@ -184,7 +184,7 @@ def indsæt(
 @click.argument("filnavn")
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
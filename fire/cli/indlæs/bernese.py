@@ -210,7 +210,7 @@ def komprimer(filer: List[click.File]) -> bytes:
 )
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
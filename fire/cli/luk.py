@@ -47,7 +47,7 @@ punkt_hjælp = f"""
 @click.argument("uuid", type=str)
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import json
 import os
 import os.path
@@ -6,6 +7,7 @@ from pathlib import Path
 from typing import (
     Dict,
     Tuple,
+    Union,
 )
 
 import click
@@ -185,7 +187,7 @@ def skriv_ark(
     # læsefejl her ikke tegn på at filen er åben (eller af anden
     # årsag låst), men på at filen ikke eksisterer.
     try:
-        gamle_navne = set(pd.read_excel(fil, sheet_name=None))
+        gamle_navne = set(læs_faneblade(fil))
     except Exception as ex:
         fire.cli.print(f"Filen '{fil}' findes ikke.")
         gamle_navne = set()
@@ -263,6 +265,9 @@ def skriv_ark(
     # Skriv de nye faneblade, efterfulgt af de resterende gamle til den
     # opdaterede fil.
     # Derved bliver de nye faneblade umiddelbart synlige, når arket åbnes.
+    #
+    # Mellemlagrede udgaver af regnearket er forældede fra nu af.
+    _læs_faneblade.cache_clear()
     try:
         with pd.ExcelWriter(fil) as writer:
             for navn in nye_faneblade:
@@ -282,16 +287,40 @@ def skriv_ark(
     return True
 
 
+# ------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=4)
+def _læs_faneblade(fil: str, ændret: int, størrelse: int) -> Dict[str, pd.DataFrame]:
+    """Læs alle faneblade fra regnearket `fil`.
+
+    Mellemlagres pr. udgave af filen, identificeret ved tidspunkt for seneste
+    ændring og filstørrelse. De returnerede DataFrames deles mellem kaldene,
+    og må derfor ikke ændres af kalderen.
+    """
+    return pd.read_excel(fil, sheet_name=None)
+
+
+def læs_faneblade(fil: Union[str, Path]) -> Dict[str, pd.DataFrame]:
+    """Læs alle faneblade fra et regneark - kun én gang pr. udgave af filen.
+
+    Flere opslag i samme regneark, fx via `find_faneblad`, genbruger derved
+    det allerede indlæste regneark, så længe filen ikke er ændret på disken.
+    """
+    sti = Path(fil).resolve()
+    status = sti.stat()
+    return _læs_faneblade(str(sti), status.st_mtime_ns, status.st_size)
+
+
 # ------------------------------------------------------------------------------
 def find_faneblad(
     projektnavn: str, faneblad: str, arkdef: Dict, ignore_failure: bool = False
 ) -> pd.DataFrame:
     try:
-        raw = pd.read_excel(
-            f"{projektnavn}.xlsx",
-            sheet_name=faneblad,
-            usecols=anvendte(arkdef),
-        ).dropna(how="all")
+        # Svarer til at læse søjlerne angivet ved `anvendte(arkdef)`
+        raw = (
+            læs_faneblade(f"{projektnavn}.xlsx")[faneblad]
+            .iloc[:, : len(arkdef)]
+            .dropna(how="all")
+        )
 
         if set(raw.columns) ^ set(arkdef):
             fire.cli.print(
@@ -364,7 +393,7 @@ def find_sag(projektnavn: str) -> Sag:
 # ------------------------------------------------------------------------------
 def find_sagsgang(projektnavn: str) -> pd.DataFrame:
     """Udtræk sagsgangsregneark fra Excelmappe"""
-    return pd.read_excel(f"{projektnavn}.xlsx", sheet_name="Sagsgang")
+    return læs_faneblade(f"{projektnavn}.xlsx")["Sagsgang"].copy()
 
 
 # ------------------------------------------------------------------------------
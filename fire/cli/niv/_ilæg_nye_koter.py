@@ -50,7 +50,7 @@ def punktdata_ikke_skal_opdateres(punktdata: dict) -> bool:
 )
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
@@ -53,7 +53,7 @@ FIKSPUNKTSYPER = {
 )
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
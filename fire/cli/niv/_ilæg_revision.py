@@ -175,7 +175,7 @@ def udfyld_udeladte_identer(ark: pd.DataFrame) -> pd.DataFrame:
 )
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
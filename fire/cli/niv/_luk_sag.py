@@ -1,5 +1,5 @@
 from io import BytesIO
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_DEFLATED
 import getpass
 
 import click
@@ -28,7 +28,7 @@ from fire.cli.niv import (
 )
 @click.option(
     "--sagsbehandler",
-    default=getpass.getuser(),
+    default=getpass.getuser,
     type=str,
     help="Angiv andet brugernavn end den aktuelt indloggede",
 )
@@ -42,7 +42,7 @@ def luk_sag(projektnavn: str, sagsbehandler, **kwargs) -> None:
     filoversigt = find_faneblad(projektnavn, "Filoversigt", arkdef.FILOVERSIGT)
     sagsmaterialer.extend(list(filoversigt["Filnavn"]))
     zipped = BytesIO()
-    with ZipFile(zipped, "w") as zipobj:
+    with ZipFile(zipped, "w", compression=ZIP_DEFLATED, compresslevel=6) as zipobj:
         for fil in sagsmaterialer:
             zipobj.write(fil)
 
@@ -86,7 +86,7 @@ def luk_sag(projektnavn: str, sagsbehandler, **kwargs) -> None:
         "Tekst": sagsevent.beskrivelse,
         "uuid": sagsevent.id,
     }
-    sagsgang = frame.append(sagsgang, sagsgangslinje)
+    sagsgang = frame.append_rows(sagsgang, [sagsgangslinje])
     fire.cli.print("Opdatér sagsgang i regneark")
     if skriv_ark(projektnavn, {"Sagsgang": sagsgang}):
         fire.cli.print(f"Sagen er nu lukket i regnearket '{projektnavn}.xlsx'")
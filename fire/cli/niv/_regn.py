@@ -1,12 +1,14 @@
 import subprocess
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from math import hypot, sqrt
-from typing import Dict, Tuple, List
-from dataclasses import dataclass, asdict
+from math import sqrt
+from typing import BinaryIO, Dict, Tuple, List
+from dataclasses import dataclass, fields
 
 import click
-import xmltodict
+import numpy as np
 from pandas import DataFrame, Timestamp, isna
 
 from fire.io.regneark import arkdef
@@ -27,43 +29,91 @@ from ._netoversigt import netanalyse
 
 @dataclass
 class Observationer:
-    journal: List[str]
-    sluk: List[str]
-    fra: List[str]
-    til: List[str]
-    delta_H: List[float]
-    L: List[int]
-    opst: List[int]
-    sigma: List[float]
-    delta: List[float]
-    kommentar: List[str]
-    hvornår: List[Timestamp]
-    T: List[float]
-    sky: List[float]
-    sol: List[float]
-    vind: List[float]
-    sigt: List[float]
-    kilde: List[str]
-    type: List[str]
-    uuid: List[str]
+    journal: np.ndarray
+    sluk: np.ndarray
+    fra: np.ndarray
+    til: np.ndarray
+    delta_H: np.ndarray
+    L: np.ndarray
+    opst: np.ndarray
+    sigma: np.ndarray
+    delta: np.ndarray
+    kommentar: np.ndarray
+    hvornår: np.ndarray
+    T: np.ndarray
+    sky: np.ndarray
+    sol: np.ndarray
+    vind: np.ndarray
+    sigt: np.ndarray
+    kilde: np.ndarray
+    type: np.ndarray
+    uuid: np.ndarray
 
 
 @dataclass
 class Arbejdssæt:
-    punkt: List[int]
-    fasthold: List[str]
-    hvornår: List[Timestamp]
-    kote: List[float]
-    sigma: List[float]
-    ny_kote: List[float]
-    ny_sigma: List[float]
-    Delta_kote: List[float]
-    opløft: List[float]
-    system: List[str]
-    nord: List[float]
-    øst: List[float]
-    uuid: List[str]
-    udelad: List[str]
+    punkt: np.ndarray
+    fasthold: np.ndarray
+    hvornår: np.ndarray
+    kote: np.ndarray
+    sigma: np.ndarray
+    ny_kote: np.ndarray
+    ny_sigma: np.ndarray
+    Delta_kote: np.ndarray
+    opløft: np.ndarray
+    system: np.ndarray
+    nord: np.ndarray
+    øst: np.ndarray
+    uuid: np.ndarray
+    udelad: np.ndarray
+
+
+# Heltalskoder for de observationstyper, der kan indgå i en beregning
+OBSERVATIONSTYPER: Dict[str, int] = {
+    "NUL": 0,
+    "MTL": 1,
+    "MGL": 2,
+}
+
+# Sammenhæng mellem søjlenavne i regnearket og felterne i dataklasserne
+OBS_FELTER: Dict[str, str] = {
+    "Journal": "journal",
+    "Sluk": "sluk",
+    "Fra": "fra",
+    "Til": "til",
+    "ΔH": "delta_H",
+    "L": "L",
+    "Opst": "opst",
+    "σ": "sigma",
+    "δ": "delta",
+    "Kommentar": "kommentar",
+    "Hvornår": "hvornår",
+    "T": "T",
+    "Sky": "sky",
+    "Sol": "sol",
+    "Vind": "vind",
+    "Sigt": "sigt",
+    "Kilde": "kilde",
+    "Type": "type",
+    "uuid": "uuid",
+}
+
+ARB_FELTER: Dict[str, str] = {
+    "Punkt": "punkt",
+    "Fasthold": "fasthold",
+    "Hvornår": "hvornår",
+    "Kote": "kote",
+    "σ": "sigma",
+    "Ny kote": "ny_kote",
+    "Ny σ": "ny_sigma",
+    "Δ-kote [mm]": "Delta_kote",
+    "Opløft [mm/år]": "opløft",
+    "System": "system",
+    "Nord": "nord",
+    "Øst": "øst",
+    "uuid": "uuid",
+    "Udelad publikation": "udelad",
+}
 
 
 @niv.command()
@@ -100,7 +150,7 @@ def regn(projektnavn: str, **kwargs) -> None:
         infiks = ""
 
     # Håndter fastholdte punkter og slukkede observationer.
-    observationer = find_faneblad(projektnavn, "Observationer", arkdef.OBSERVATIONER)
+    observationsark = find_faneblad(projektnavn, "Observationer", arkdef.OBSERVATIONER)
     punktoversigt = find_faneblad(projektnavn, "Punktoversigt", arkdef.PUNKTOVERSIGT)
     arbejdssæt = find_faneblad(projektnavn, aktuelt_faneblad, arkdef.PUNKTOVERSIGT)
 
@@ -108,10 +158,8 @@ def regn(projektnavn: str, **kwargs) -> None:
     if not kontrol:
         arbejdssæt["Hvornår"] = punktoversigt["Hvornår"]
 
-    arb_søjler = arbejdssæt.columns
-    obs_søjler = observationer.columns
     # Konverter til dataklasse
-    observationer = obs_til_dataklasse(observationer)
+    observationer = obs_til_dataklasse(observationsark)
     arbejdssæt = arb_til_dataklasse(arbejdssæt)
 
     # Lokalisér fastholdte punkter
@@ -141,25 +189,43 @@ def regn(projektnavn: str, **kwargs) -> None:
 
     # Opdater arbejdssæt med GNU Gama output
     beregning = opdater_arbejdssæt(punkter, koter, varianser, arbejdssæt, t_gyldig)
-    værdier = []
-    for _, værdi in asdict(beregning).items():
-        værdier.append(værdi)
-    beregning = DataFrame(list(zip(*værdier)), columns=arb_søjler)
+    beregning = DataFrame(
+        {søjle: getattr(beregning, felt) for søjle, felt in ARB_FELTER.items()}
+    )
     resultater[næste_faneblad] = beregning
 
-    # ...og beret om resultaterne
-    skriv_punkter_geojson(projektnavn, resultater[næste_faneblad], infiks=infiks)
-    obs = []
-    for _, o in asdict(observationer).items():
-        obs.append(o)
-    observationer = DataFrame(list(zip(*obs)), columns=obs_søjler)
-    skriv_observationer_geojson(
-        projektnavn,
-        resultater[næste_faneblad].set_index("Punkt"),
-        observationer,
-        infiks=infiks,
-    )
-    skriv_ark(projektnavn, resultater)
+    # ...og beret om resultaterne. Observationerne ændres ikke undervejs, så
+    # regnearkets udgave kan bruges direkte, blot med fortløbende indeks
+    observationsark = observationsark.reset_index(drop=True)
+
+    # GeoJSON-filerne er indbyrdes uafhængige og deler kun data der læses, så
+    # de kan skrives samtidigt. Kun skriv_punkter_geojson slår op i databasen,
+    # så databasesessionen bruges aldrig fra mere end én tråd ad gangen.
+    # Regnearket skrives i hovedtråden, da skriv_ark kan spørge brugeren om
+    # at lukke filen, hvis den er åben i Excel.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        skrivninger = [
+            executor.submit(
+                skriv_punkter_geojson,
+                projektnavn,
+                resultater[næste_faneblad],
+                infiks=infiks,
+            ),
+            executor.submit(
+                skriv_observationer_geojson,
+                projektnavn,
+                resultater[næste_faneblad].set_index("Punkt"),
+                observationsark,
+                infiks=infiks,
+            ),
+        ]
+        skriv_ark(projektnavn, resultater)
+
+    # Videregiv eventuelle undtagelser fra GeoJSON-skrivningerne. Regnearket
+    # er da allerede skrevet, så beregningsresultatet går ikke tabt
+    for skrivning in skrivninger:
+        skrivning.result()
+
     if fire.cli.firedb.config.getboolean("general", "niv_open_files"):
         webbrowser.open_new_tab(htmlrapportnavn)
         fire.cli.print("Færdig! - åbner regneark og resultatrapport for check.")
@@ -167,46 +233,16 @@ def regn(projektnavn: str, **kwargs) -> None:
 
 
 # -----------------------------------------------------------------------------
-def obs_til_dataklasse(obs: DataFrame):
+def obs_til_dataklasse(obs: DataFrame) -> Observationer:
     return Observationer(
-        journal=list(obs["Journal"]),
-        sluk=list(obs["Sluk"]),
-        fra=list(obs["Fra"]),
-        til=list(obs["Til"]),
-        delta_H=list(obs["ΔH"]),
-        L=list(obs["L"]),
-        opst=list(obs["Opst"]),
-        sigma=list(obs["σ"]),
-        delta=list(obs["δ"]),
-        kommentar=list(obs["Kommentar"]),
-        hvornår=list(obs["Hvornår"]),
-        T=list(obs["T"]),
-        sky=list(obs["Sky"]),
-        sol=list(obs["Sol"]),
-        vind=list(obs["Vind"]),
-        sigt=list(obs["Sigt"]),
-        kilde=list(obs["Kilde"]),
-        type=list(obs["Type"]),
-        uuid=list(obs["uuid"]),
+        **{felt: obs[søjle].to_numpy() for søjle, felt in OBS_FELTER.items()}
     )
 
 
-def arb_til_dataklasse(arb: DataFrame):
+def arb_til_dataklasse(arb: DataFrame) -> Arbejdssæt:
+    # Arbejdssættet opdateres undervejs i beregningen, så vi tager en kopi
     return Arbejdssæt(
-        punkt=list(arb["Punkt"]),
-        fasthold=list(arb["Fasthold"]),
-        hvornår=list(arb["Hvornår"]),
-        kote=list(arb["Kote"]),
-        sigma=list(arb["σ"]),
-        ny_kote=list(arb["Ny kote"]),
-        ny_sigma=list(arb["Ny σ"]),
-        Delta_kote=list(arb["Δ-kote [mm]"]),
-        opløft=list(arb["Opløft [mm/år]"]),
-        system=list(arb["System"]),
-        nord=list(arb["Nord"]),
-        øst=list(arb["Øst"]),
-        uuid=list(arb["uuid"]),
-        udelad=list(arb["Udelad publikation"]),
+        **{felt: arb[søjle].to_numpy(copy=True) for søjle, felt in ARB_FELTER.items()}
     )
 
 
@@ -220,8 +256,8 @@ def spredning(
 ) -> float:
     """Apriorispredning for nivellementsobservation
 
-    Fx.  MTL: spredning("mtl", 500, 3, 2, 0.5) = 1.25
-         MGL: spredning("MGL", 500, 3, 0.6, 0.01) = 0.4243
+    Fx.  MTL: spredning("mtl", 500, 3, 2, 0.5) = 1.3229
+         MGL: spredning("MGL", 500, 3, 0.6, 0.01) = 0.4246
          NUL: spredning("NUL", .....) = 0
 
     Rejser ValueError ved ukendt observationstype eller
@@ -235,35 +271,138 @@ def spredning(
     der eksakt reproducerer koteforskellen mellem to fastholdte
     punkter
     """
+    kode = OBSERVATIONSTYPER.get(observationstype.upper())
+    if kode is None:
+        raise ValueError(f"Ukendt observationstype: {observationstype}")
 
-    if "NUL" == observationstype.upper():
+    if kode == OBSERVATIONSTYPER["NUL"]:
         return 0
 
-    opstillingsafhængig = sqrt(antal_opstillinger * (centreringsspredning_i_mm**2))
-
-    if "MTL" == observationstype.upper():
+    if kode == OBSERVATIONSTYPER["MTL"]:
         afstandsafhængig = afstandsafhængig_spredning_i_mm * afstand_i_m / 1000
-        return hypot(afstandsafhængig, opstillingsafhængig)
-
-    if "MGL" == observationstype.upper():
+    else:
         afstandsafhængig = afstandsafhængig_spredning_i_mm * sqrt(afstand_i_m / 1000)
-        return hypot(afstandsafhængig, opstillingsafhængig)
 
-    raise ValueError(f"Ukendt observationstype: {observationstype}")
+    # Værdierne er i millimeter, så vi behøver ikke hypots værn mod overløb
+    opstillingsafhængig_i_anden = antal_opstillinger * (
+        centreringsspredning_i_mm * centreringsspredning_i_mm
+    )
+    return sqrt(afstandsafhængig * afstandsafhængig + opstillingsafhængig_i_anden)
+
+
+def observationstypekoder(observationstyper: np.ndarray) -> np.ndarray:
+    """Heltalskoder, jf. OBSERVATIONSTYPER, for en række observationstyper
+
+    Hver forskellig typebetegnelse fortolkes kun én gang, uanset hvor mange
+    observationer der er af typen.
+
+    Rejser ValueError ved ukendte observationstyper.
+    """
+    unikke, placering = np.unique(
+        np.asarray(observationstyper, dtype=str), return_inverse=True
+    )
+    koder = np.empty(len(unikke), dtype=np.int8)
+    for i, observationstype in enumerate(unikke):
+        kode = OBSERVATIONSTYPER.get(observationstype.upper())
+        if kode is None:
+            raise ValueError(f"Ukendt observationstype: {observationstype}")
+        koder[i] = kode
+    return koder[placering]
+
+
+def spredninger(
+    observationstyper: np.ndarray,
+    afstande_i_m: np.ndarray,
+    antal_opstillinger: np.ndarray,
+    afstandsafhængige_spredninger_i_mm: np.ndarray,
+    centreringsspredninger_i_mm: np.ndarray,
+) -> np.ndarray:
+    """Apriorispredninger for en række nivellementsobservationer
+
+    Vektoriseret udgave af `spredning`, der beregner spredningerne for alle
+    observationer i ét hug. Argumenterne er sekvenser af samme længde, med
+    samme betydning som de tilsvarende argumenter til `spredning`.
+
+    Rejser ValueError ved ukendte observationstyper og, ligesom `spredning`,
+    ved negativ afstand for MGL-observationer.
+    """
+    koder = observationstypekoder(observationstyper)
+
+    L = np.asarray(afstande_i_m, dtype=float)
+    opst = np.asarray(antal_opstillinger, dtype=float)
+    sigma = np.asarray(afstandsafhængige_spredninger_i_mm, dtype=float)
+    delta = np.asarray(centreringsspredninger_i_mm, dtype=float)
+
+    mtl = koder == OBSERVATIONSTYPER["MTL"]
+    nul = koder == OBSERVATIONSTYPER["NUL"]
+    mgl = ~mtl & ~nul
+    beregnes = ~nul
+
+    # np.sqrt giver nan for negative tal, hvor math.sqrt i `spredning` rejser
+    # ValueError. Vi tjekker derfor selv, så fejlen ikke ender i Gama-inputfilen
+    if (L[mgl] < 0).any():
+        raise ValueError(f"Negativ afstand for MGL-observation: {L[mgl].min()}")
+
+    afstandsafhængig = np.zeros_like(L)
+    afstandsafhængig[mtl] = sigma[mtl] * L[mtl] / 1000
+    afstandsafhængig[mgl] = sigma[mgl] * np.sqrt(L[mgl] / 1000)
+
+    i_anden = afstandsafhængig[beregnes] ** 2 + opst[beregnes] * (
+        delta[beregnes] * delta[beregnes]
+    )
+    if (i_anden < 0).any():
+        raise ValueError("Negativ varians - kontroller antal opstillinger")
+
+    resultat = np.zeros_like(L)
+    resultat[beregnes] = np.sqrt(i_anden)
+    return resultat
 
 
 # ------------------------------------------------------------------------------
 def find_fastholdte(arbejdssæt: Arbejdssæt, kontrol: bool) -> Dict[str, float]:
-    """Find fastholdte punkter til gama beregning"""
+    """Find fastholdte punkter til gama beregning
 
+    Ved kontrolberegning fastholdes punkter markeret med 'x' i søjlen
+    'Fasthold', ved endelig beregning alle punkter med en markering.
+    """
+    fasthold = np.asarray(arbejdssæt.fasthold)
     if kontrol:
-        relevante = arbejdssæt.fasthold == "x"
+        relevante = fasthold == "x"
     else:
-        relevante = arbejdssæt.fasthold != ""
+        relevante = fasthold != ""
+
+    punkter = np.asarray(arbejdssæt.punkt)[relevante].tolist()
+    koter = np.asarray(arbejdssæt.kote)[relevante].tolist()
+    return dict(zip(punkter, koter))
+
+
+# Faste dele af Gama-inputfilen, kodet én gang for alle. Kun projektnavnet
+# i beskrivelsen udfyldes ved hver kørsel
+_GAMA_PRÆAMBEL = (
+    b"<?xml version='1.0' ?><gama-local>\n"
+    b"<network angles='left-handed' axes-xy='en' epoch='0.0'>\n"
+    b"<parameters\n"
+    b"    algorithm='gso' angles='400' conf-pr='0.95'\n"
+    b"    cov-band='0' ellipsoid='grs80' latitude='55.7' sigma-act='aposteriori'\n"
+    b"    sigma-apr='1.0' tol-abs='1000.0'\n"
+    b"/>\n\n"
+    b"<description>\n"
+    b"    Nivellementsprojekt %b\n"
+    b"</description>\n"
+    b"<points-observations>\n\n"
+)
+_GAMA_POSTAMBEL = (
+    b"</height-differences>\n"
+    b"</points-observations>\n"
+    b"</network>\n"
+    b"</gama-local>\n"
+)
 
-    fastholdte_punkter = tuple([arbejdssæt.punkt[relevante]])
-    fastholdte_koter = tuple([arbejdssæt.kote[relevante]])
-    return dict(zip(fastholdte_punkter, fastholdte_koter))
+# Skabelon for en observationslinje i Gama-inputfilen. Udfyldes med
+# (fra, til, delta_H, L, stdev, journal) for hver observation
+_DH_SKABELON = (
+    "<dh from='%s' to='%s' val='%+.6f' dist='%.5f' stdev='%.5f' extern='%s'/>\n"
+)
 
 
 def skriv_gama_inputfil(
@@ -274,63 +413,51 @@ def skriv_gama_inputfil(
 ):
     """
     Skriv gama-inputfil i XML-format
-    """
-    with open(f"{projektnavn}.xml", "wt") as gamafil:
-        # Preambel
-        gamafil.write(
-            f"<?xml version='1.0' ?><gama-local>\n"
-            f"<network angles='left-handed' axes-xy='en' epoch='0.0'>\n"
-            f"<parameters\n"
-            f"    algorithm='gso' angles='400' conf-pr='0.95'\n"
-            f"    cov-band='0' ellipsoid='grs80' latitude='55.7' sigma-act='aposteriori'\n"
-            f"    sigma-apr='1.0' tol-abs='1000.0'\n"
-            f"/>\n\n"
-            f"<description>\n"
-            f"    Nivellementsprojekt {ascii(projektnavn)}\n"  # Gama kaster op over Windows-1252 tegn > 127
-            f"</description>\n"
-            f"<points-observations>\n\n"
-        )
 
-        # Fastholdte punkter
-        gamafil.write("\n\n<!-- Fixed -->\n\n")
-        for punkt, kote in fastholdte.items():
-            gamafil.write(f"<point fix='Z' id='{punkt}' z='{kote}'/>\n")
-
-        # Punkter til udjævning
-        gamafil.write("\n\n<!-- Adjusted -->\n\n")
-        for punkt in estimerede_punkter:
-            gamafil.write(f"<point adj='z' id='{punkt}'/>\n")
-
-        # Observationer
-        gamafil.write("<height-differences>\n")
-        for (sluk, fra, til, delta_H, L, type, opst, sigma, delta, journal) in zip(
-            observationer.sluk,
-            observationer.fra,
-            observationer.til,
-            observationer.delta_H,
-            observationer.L,
-            observationer.type,
-            observationer.opst,
-            observationer.sigma,
-            observationer.delta,
-            observationer.journal,
-        ):
-            if sluk == "x":
-                continue
-            gamafil.write(
-                f"<dh from='{fra}' to='{til}' "
-                f"val='{delta_H:+.6f}' "
-                f"dist='{L:.5f}' stdev='{spredning(type, L, opst, sigma, delta):.5f}' "
-                f"extern='{journal}'/>\n"
-            )
+    Filens indhold opbygges som en liste af tekststykker, der kodes og skrives
+    til disk i én operation, frem for en skrivning pr. observation.
+    """
+    # Preambel - Gama kaster op over Windows-1252 tegn > 127, derfor ascii()
+    præambel = _GAMA_PRÆAMBEL % ascii(projektnavn).encode("ascii")
+
+    # Fastholdte punkter
+    dele = ["\n\n<!-- Fixed -->\n\n"]
+    dele.extend(
+        f"<point fix='Z' id='{punkt}' z='{kote}'/>\n"
+        for punkt, kote in fastholdte.items()
+    )
 
-        # Postambel
-        gamafil.write(
-            "</height-differences>\n"
-            "</points-observations>\n"
-            "</network>\n"
-            "</gama-local>\n"
+    # Punkter til udjævning
+    dele.append("\n\n<!-- Adjusted -->\n\n")
+    dele.extend(f"<point adj='z' id='{punkt}'/>\n" for punkt in estimerede_punkter)
+
+    # Observationer - slukkede observationer sorteres fra inden vi går i gang
+    obs = observationer
+    aktive = np.asarray(obs.sluk) != "x"
+    stdev = spredninger(
+        obs.type[aktive],
+        obs.L[aktive],
+        obs.opst[aktive],
+        obs.sigma[aktive],
+        obs.delta[aktive],
+    )
+    dele.append("<height-differences>\n")
+    dele.extend(
+        _DH_SKABELON % række
+        for række in zip(
+            obs.fra[aktive],
+            obs.til[aktive],
+            obs.delta_H[aktive],
+            obs.L[aktive],
+            stdev,
+            obs.journal[aktive],
         )
+    )
+
+    with open(f"{projektnavn}.xml", "wb", buffering=1 << 20) as gamafil:
+        gamafil.write(præambel)
+        gamafil.write("".join(dele).encode("utf-8"))
+        gamafil.write(_GAMA_POSTAMBEL)
 
 
 def gama_udjævn(projektnavn: str, kontrol: bool):
@@ -372,23 +499,53 @@ def læs_gama_output(
     """
     Læser output fra GNU Gama og returnerer relevante parametre til at skrive xlsx fil
     """
-    with open(f"{projektnavn}-resultat.xml") as resultat:
-        doc = xmltodict.parse(resultat.read())
+    with open(f"{projektnavn}-resultat.xml", "rb") as resultat:
+        punkter, koter, varianser = læs_gama_koordinater(resultat)
 
+    assert len(koter) == len(varianser), "Mismatch mellem antal koter og varianser"
+    tg = gyldighedstidspunkt(projektnavn)
+    return (punkter, koter, varianser, tg)
+
+
+def læs_gama_koordinater(
+    resultat: BinaryIO,
+) -> Tuple[List[str], List[float], List[float]]:
+    """
+    Læs udjævnede punkter, koter og varianser fra GNU Gamas xml-resultat
+
+    Dokumentet gennemløbes som en strøm, så kun de elementer vi har brug for
+    opbygges i hukommelsen. Navnerum ignoreres.
+    """
     # Sammenhængen mellem rækkefølgen af elementer i Gamas punktliste (koteliste
     # herunder) og varianserne i covariansmatricens diagonal er uklart beskrevet:
     # I Gamas xml-resultatfil antydes at der skal foretages en ombytning.
     # Men rækkefølgen anvendt her passer sammen med det Gama præsenterer i
     # html-rapportudgaven af beregningsresultatet.
-    koteliste = doc["gama-local-adjustment"]["coordinates"]["adjusted"]["point"]
-    varliste = doc["gama-local-adjustment"]["coordinates"]["cov-mat"]["flt"]
-    # try:
-    punkter = [punkt["id"] for punkt in koteliste]
-    koter = [float(punkt["z"]) for punkt in koteliste]
-    varianser = [float(var) for var in varliste]
-    assert len(koter) == len(varianser), "Mismatch mellem antal koter og varianser"
-    tg = gyldighedstidspunkt(projektnavn)
-    return (punkter, koter, varianser, tg)
+    punkter = []
+    koter = []
+    varianser = []
+
+    sti = []
+    for hændelse, element in ET.iterparse(resultat, events=("start", "end")):
+        tag = element.tag.rpartition("}")[2]
+        if hændelse == "start":
+            sti.append(tag)
+            continue
+
+        sti.pop()
+        if tag == "point" and sti[-2:] == ["coordinates", "adjusted"]:
+            punkt = {barn.tag.rpartition("}")[2]: barn.text for barn in element}
+            punkter.append(punkt["id"])
+            koter.append(float(punkt["z"]))
+            element.clear()
+        elif tag == "flt" and sti[-2:] == ["coordinates", "cov-mat"]:
+            varianser.append(float(element.text))
+            element.clear()
+        elif len(sti) == 1:
+            # Ryd op efter hver afsluttet sektion i dokumentet
+            element.clear()
+
+    return (punkter, koter, varianser)
 
 
 # ------------------------------------------------------------------------------
@@ -400,51 +557,63 @@ def opdater_arbejdssæt(
     tg: Timestamp,
 ) -> Arbejdssæt:
 
-    for j, (punkt, ny_kote, var) in enumerate(zip(punkter, koter, varianser)):
-        if punkt in arbejdssæt.punkt:
-            # Hvis punkt findes, sæt indeks til hvor det findes
-            i = arbejdssæt.punkt.index(punkt)
-            if i > j:
-                # Gem info i det punkt hvis allerede skrevet
-                arbejdssæt.punkt.append(arbejdssæt.punkt[i])
-                arbejdssæt.ny_sigma.append(arbejdssæt.ny_sigma[i])
-                arbejdssæt.hvornår.append(arbejdssæt.hvornår[i])
-                arbejdssæt.system.append("DVR90")
-            # Overskriv info i punkt der findes
-            arbejdssæt.punkt[i] = punkt
-            arbejdssæt.ny_kote[i] = ny_kote
-            arbejdssæt.ny_sigma[i] = sqrt(var)
-
-            # Ændring i millimeter...
-            Delta = (ny_kote - arbejdssæt.kote[i]) * 1000.0
-            # ...men vi ignorerer ændringer under mikrometerniveau
-            if abs(Delta) < 0.001:
-                Delta = 0
-            arbejdssæt.Delta_kote[i] = Delta
-            dt = tg - arbejdssæt.hvornår[i]
-            dt = dt.total_seconds() / (365.25 * 86400)
-            # t = 0 forekommer ved genberegning af allerede registrerede koter
-            if dt == 0:
-                continue
-            arbejdssæt.opløft[i] = Delta / dt
-            arbejdssæt.hvornår[i] = tg
-            arbejdssæt.system[i] = "DVR90"
-        else:
-            # Tilføj nye punkter
-            arbejdssæt.punkt.append(punkt)
-            arbejdssæt.ny_sigma.append(sqrt(var))
-            arbejdssæt.hvornår.append(tg)
-            arbejdssæt.ny_kote.append(ny_kote)
-            arbejdssæt.system.append("DVR90")
-
-            # Fyld
-            arbejdssæt.fasthold.append("")
-            arbejdssæt.kote.append(None)
-            arbejdssæt.sigma.append(None)
-            arbejdssæt.Delta_kote.append(None)
-            arbejdssæt.opløft.append(None)
-            arbejdssæt.øst.append(None)
-            arbejdssæt.nord.append(None)
-            arbejdssæt.uuid.append(None)
-            arbejdssæt.udelad.append("")
+    # Opslag fra punktnavn til (første) række i arbejdssættet
+    indeks = {}
+    for i, punkt in enumerate(arbejdssæt.punkt):
+        indeks.setdefault(punkt, i)
+
+    # Nye punkter samles op og tilføjes til sidst, så hvert felt kun skal
+    # udvides én gang
+    nye = {}
+    for punkt, ny_kote, var in zip(punkter, koter, varianser):
+        # Hvis punkt findes, sæt indeks til hvor det findes
+        i = indeks.get(punkt)
+        if i is None:
+            nye[punkt] = (ny_kote, sqrt(var))
+            continue
+
+        # Overskriv info i punkt der findes
+        arbejdssæt.ny_kote[i] = ny_kote
+        arbejdssæt.ny_sigma[i] = sqrt(var)
+
+        # Ændring i millimeter...
+        Delta = (ny_kote - arbejdssæt.kote[i]) * 1000.0
+        # ...men vi ignorerer ændringer under mikrometerniveau
+        if abs(Delta) < 0.001:
+            Delta = 0
+        arbejdssæt.Delta_kote[i] = Delta
+        dt = tg - Timestamp(arbejdssæt.hvornår[i])
+        dt = dt.total_seconds() / (365.25 * 86400)
+        # t = 0 forekommer ved genberegning af allerede registrerede koter
+        if dt == 0:
+            continue
+        arbejdssæt.opløft[i] = Delta / dt
+        arbejdssæt.hvornår[i] = tg
+        arbejdssæt.system[i] = "DVR90"
+
+    if not nye:
+        return arbejdssæt
+
+    # Tilføj nye punkter
+    n = len(nye)
+    nye_rækker = {
+        "punkt": list(nye),
+        "fasthold": [""] * n,
+        "hvornår": [np.datetime64(tg)] * n,
+        "kote": [np.nan] * n,
+        "sigma": [np.nan] * n,
+        "ny_kote": [ny_kote for ny_kote, _ in nye.values()],
+        "ny_sigma": [ny_sigma for _, ny_sigma in nye.values()],
+        "Delta_kote": [np.nan] * n,
+        "opløft": [np.nan] * n,
+        "system": ["DVR90"] * n,
+        "nord": [np.nan] * n,
+        "øst": [np.nan] * n,
+        "uuid": [None] * n,
+        "udelad": [""] * n,
+    }
+    for felt in fields(arbejdssæt):
+        eksisterende = getattr(arbejdssæt, felt.name)
+        tilføjes = np.asarray(nye_rækker[felt.name])
+        setattr(arbejdssæt, felt.name, np.concatenate((eksisterende, tilføjes)))
     return arbejdssæt
@@ -19,6 +19,7 @@ Typiske opgaver i FIRE-kodebasen:
 """
 from typing import (
     Any,
+    Iterable,
     Union,
 )
 import pandas as pd
@@ -75,6 +76,22 @@ def append_iterable(
     return append_series(df, pd.Series(row, index=df.columns), **kwargs)
 
 
+def append_rows(df: pd.DataFrame, rows: Iterable[dict], /, **kwargs) -> pd.DataFrame:
+    """
+    Tilføj flere rækker, givet som dicts, i forlængelse af de eksisterende rækker.
+
+    Rækkerne samles i én dataframe inden de føjes til `df`, så der kun
+    foretages én sammenkædning uanset antallet af rækker. Søjler der ikke
+    er angivet i en række udfyldes med manglende værdier.
+
+    """
+    rows = list(rows)
+    if any(set(row) - set(df.columns) for row in rows):
+        raise ValueError("Kolonner i ark og række skal matche.")
+
+    return append_df(df, pd.DataFrame(rows, columns=df.columns), **kwargs)
+
+
 append_df.__doc__ = append.__doc__
 append_series.__doc__ = append.__doc__
 append_iterable.__doc__ = append.__doc__
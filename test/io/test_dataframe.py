@@ -1,10 +1,12 @@
 import pandas as pd
+import pytest
 
 from fire.io.dataframe import (
     append,
     append_df,
     append_series,
     append_iterable,
+    append_rows,
     insert,
     insert_series,
     insert_iterable,
@@ -188,6 +190,44 @@ def test_append_list_also_works_for_tuple_record():
     assert all(result == expected)
 
 
+def test_append_rows():
+    columns = ("A", "B", "C")
+
+    rows_initial = [
+        [1, "a", "x"],
+        [2, "b", "y"],
+    ]
+    rows_to_be_appended = [
+        {"A": 3, "B": "c", "C": "z"},
+        {"A": 4, "B": "d", "C": "w"},
+    ]
+
+    rows_expected = [
+        [1, "a", "x"],
+        [2, "b", "y"],
+        [3, "c", "z"],
+        [4, "d", "w"],
+    ]
+
+    df = pd.DataFrame(rows_initial, columns=columns)
+
+    expected = pd.DataFrame(rows_expected, columns=columns)
+    result = append_rows(df, rows_to_be_appended)
+
+    assert all(result == expected)
+    assert list(result.index) == [0, 1, 2, 3]
+    assert all(result.dtypes == df.dtypes)
+
+    # Case: When dict has not all columns of df
+    result = append_rows(df, [{"A": 3, "C": "z"}])
+    assert list(result.columns) == list(columns)
+    assert pd.isna(result.at[2, "B"])
+
+    # Case: When dict has columns not in df
+    with pytest.raises(ValueError):
+        append_rows(df, [{"A": 3, "B": "c", "C": "z", "D": "?"}])
+
+
 def test_insert():
     # General
     columns = ("A", "B", "C")
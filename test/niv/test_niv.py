@@ -7,6 +7,7 @@ from fire.io.regneark import arkdef
 from fire.cli.niv import (
     niv,
     find_faneblad,
+    find_sagsgang,
     skriv_ark,
 )
 
@@ -114,3 +115,44 @@ def test_observationer(mocker):
         print(result)
         print(result.output)
         assert result.exit_code == 0
+
+
+def test_find_faneblad_genbruger_regneark(mocker):
+    """Regnearket indlæses kun igen, når det er ændret på disken"""
+    runner = CliRunner()
+
+    with runner.isolated_filesystem():
+        parametre = pd.DataFrame({"Navn": ["Database"], "Værdi": ["ci"]})
+        sagsgang = pd.DataFrame(
+            {
+                "Dato": [pd.Timestamp("2020-01-01")],
+                "Hvem": ["test"],
+                "Hændelse": ["sagsoprettelse"],
+                "Tekst": ["En test"],
+                "uuid": ["abc"],
+            }
+        )
+        with pd.ExcelWriter("testsag.xlsx") as writer:
+            parametre.to_excel(writer, sheet_name="Parametre", index=False)
+            sagsgang.to_excel(writer, sheet_name="Sagsgang", index=False)
+
+        read_excel = mocker.spy(pd, "read_excel")
+
+        param = find_faneblad("testsag", "Parametre", arkdef.PARAM)
+        find_faneblad("testsag", "Parametre", arkdef.PARAM)
+        find_sagsgang("testsag")
+        assert read_excel.call_count == 1
+        assert list(param["Værdi"]) == ["ci"]
+
+        # Ændringer af de udleverede faneblade påvirker ikke senere opslag
+        param["Værdi"] = "ændret"
+        assert list(find_faneblad("testsag", "Parametre", arkdef.PARAM)["Værdi"]) == [
+            "ci"
+        ]
+
+        # Efter skrivning læses den opdaterede udgave
+        parametre["Værdi"] = ["test"]
+        assert skriv_ark("testsag", {"Parametre": parametre})
+        param = find_faneblad("testsag", "Parametre", arkdef.PARAM)
+        assert list(param["Værdi"]) == ["test"]
+        assert list(find_sagsgang("testsag")["uuid"]) == ["abc"]
@@ -0,0 +1,223 @@
+from dataclasses import fields
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fire.cli.niv._regn import (
+    ARB_FELTER,
+    OBS_FELTER,
+    OBSERVATIONSTYPER,
+    arb_til_dataklasse,
+    find_fastholdte,
+    læs_gama_koordinater,
+    obs_til_dataklasse,
+    observationstypekoder,
+    opdater_arbejdssæt,
+    skriv_gama_inputfil,
+    spredning,
+    spredninger,
+)
+
+
+def test_spredninger():
+    """Vektoriseret apriorispredning stemmer overens med den skalare udgave"""
+    typer = ["MTL", "mgl", "NUL", "mtl", "MGL"]
+    afstande = [500, 500, 500, 1200, 35]
+    opstillinger = [3, 3, 3, 7, 1]
+    sigma = [2, 0.6, 0.6, 1.5, 0.4]
+    delta = [0.5, 0.01, 0.01, 0.2, 0.05]
+
+    forventet = [
+        spredning(*argumenter)
+        for argumenter in zip(typer, afstande, opstillinger, sigma, delta)
+    ]
+    resultat = spredninger(typer, afstande, opstillinger, sigma, delta)
+
+    assert resultat.shape == (len(typer),)
+    assert np.allclose(resultat, forventet)
+    assert resultat[2] == 0
+
+    with pytest.raises(ValueError):
+        spredninger(["MTL", "XYZ"], [1, 1], [1, 1], [1, 1], [1, 1])
+
+
+def test_spredninger_negativ_afstand():
+    """Som `spredning` afvises negativ afstand for MGL - MTL og NUL tåler den"""
+    with pytest.raises(ValueError):
+        spredning("MGL", -10, 1, 0.6, 0.01)
+    with pytest.raises(ValueError):
+        spredninger(["MGL"], [-10], [1], [0.6], [0.01])
+    with pytest.raises(ValueError):
+        spredninger(["MTL", "MGL"], [10, -10], [1, 1], [0.6, 0.6], [0.01, 0.01])
+
+    resultat = spredninger(["MTL", "NUL"], [-10, -10], [1, 1], [2, 0.6], [0.5, 0.01])
+    assert resultat[0] == pytest.approx(spredning("MTL", -10, 1, 2, 0.5))
+    assert resultat[1] == 0
+
+
+def test_spredning():
+    """Eksemplerne fra docstringen holder"""
+    assert spredning("mtl", 500, 3, 2, 0.5) == pytest.approx(1.3229, abs=1e-4)
+    assert spredning("MGL", 500, 3, 0.6, 0.01) == pytest.approx(0.4246, abs=1e-4)
+    assert spredning("NUL", 500, 3, 0.6, 0.01) == 0
+    assert spredning("MTL", 500, 3, -2, -0.5) == spredning("MTL", 500, 3, 2, 0.5)
+
+    with pytest.raises(ValueError):
+        spredning("XYZ", 500, 3, 0.6, 0.01)
+
+
+def test_observationstypekoder():
+    koder = observationstypekoder(["mtl", "MGL", "NUL", "MTL", "mgl"])
+    forventet = [OBSERVATIONSTYPER[t] for t in ("MTL", "MGL", "NUL", "MTL", "MGL")]
+
+    assert koder.dtype == np.int8
+    assert list(koder) == forventet
+
+    with pytest.raises(ValueError):
+        observationstypekoder(["MTL", ""])
+
+
+GAMA_RESULTAT = b"""<?xml version="1.0" ?>
+<gama-local-adjustment xmlns="http://www.gnu.org/software/gama/gama-local-adjustment">
+<description>Nivellementsprojekt 'test'</description>
+<coordinates>
+<fixed>
+<point><id>A</id><z>10.0</z></point>
+</fixed>
+<approximate>
+<point><id>B</id><z>12.0</z></point>
+<point><id>C</id><z>13.0</z></point>
+</approximate>
+<adjusted>
+<point><id>B</id><z>12.001</z></point>
+<point><id>C</id><z>13.002</z></point>
+</adjusted>
+<orientation-shifts></orientation-shifts>
+<cov-mat>
+<dim>2</dim> <band>0</band>
+<flt>1.0e-06</flt>
+<flt>4.0e-06</flt>
+</cov-mat>
+<original-index><ind>1</ind><ind>2</ind></original-index>
+</coordinates>
+<observations>
+<height-diff><from>A</from><to>B</to><obs>2.0</obs></height-diff>
+</observations>
+</gama-local-adjustment>
+"""
+
+
+def test_læs_gama_koordinater():
+    """Kun udjævnede punkter og kovariansmatricens diagonal læses"""
+    punkter, koter, varianser = læs_gama_koordinater(BytesIO(GAMA_RESULTAT))
+
+    assert punkter == ["B", "C"]
+    assert koter == [12.001, 13.002]
+    assert varianser == [1.0e-06, 4.0e-06]
+
+
+def test_opdater_arbejdssæt():
+    """Eksisterende punkter opdateres og nye punkter føjes til arbejdssættet"""
+    arbejdssæt = pd.DataFrame(
+        {
+            "Punkt": ["C", "A", "B"],
+            "Fasthold": ["", "x", ""],
+            "Hvornår": pd.to_datetime(["2020-01-01", "2020-01-01", "2021-01-01"]),
+            "Kote": [3.0, 1.0, 2.0],
+            "σ": [0.1, 0.1, 0.1],
+            "Ny kote": np.nan,
+            "Ny σ": np.nan,
+            "Δ-kote [mm]": np.nan,
+            "Opløft [mm/år]": np.nan,
+            "System": "",
+            "Nord": [1.0, 2.0, 3.0],
+            "Øst": [1.0, 2.0, 3.0],
+            "uuid": ["c", "a", "b"],
+            "Udelad publikation": "",
+        }
+    )
+    tg = pd.Timestamp("2021-01-01")
+
+    beregning = opdater_arbejdssæt(
+        ["B", "C", "D"],
+        [2.001, 3.0, 4.0],
+        [1.0e-06, 4.0e-06, 9.0e-06],
+        arb_til_dataklasse(arbejdssæt),
+        tg,
+    )
+
+    assert list(beregning.punkt) == ["C", "A", "B", "D"]
+    assert list(beregning.ny_kote[[0, 2, 3]]) == [3.0, 2.001, 4.0]
+    assert np.isnan(beregning.ny_kote[1])
+    assert np.allclose(beregning.ny_sigma[[0, 2, 3]], [0.002, 0.001, 0.003])
+    assert beregning.Delta_kote[0] == 0
+    assert beregning.Delta_kote[2] == pytest.approx(1.0)
+    # Genberegning til samme tidspunkt giver intet opløft
+    assert np.isnan(beregning.opløft[2])
+    assert beregning.opløft[0] == 0
+    assert list(beregning.system) == ["DVR90", "", "", "DVR90"]
+    assert beregning.hvornår[3] == np.datetime64(tg)
+    assert beregning.uuid[3] is None
+    # Alle felter har samme længde
+    assert {len(getattr(beregning, f.name)) for f in fields(beregning)} == {4}
+
+
+def test_find_fastholdte():
+    """Kontrolberegning fastholder kun 'x'-punkter, endelig alle markerede"""
+    arbejdssæt = pd.DataFrame({søjle: [None] * 4 for søjle in ARB_FELTER})
+    arbejdssæt["Punkt"] = ["A", "B", "C", "D"]
+    arbejdssæt["Fasthold"] = ["x", "", "y", "x"]
+    arbejdssæt["Kote"] = [1.0, 2.0, 3.0, 4.0]
+    arbejdssæt = arb_til_dataklasse(arbejdssæt)
+
+    kontrol = find_fastholdte(arbejdssæt, kontrol=True)
+    assert kontrol == {"A": 1.0, "D": 4.0}
+    assert all(type(kote) is float for kote in kontrol.values())
+
+    endelig = find_fastholdte(arbejdssæt, kontrol=False)
+    assert endelig == {"A": 1.0, "C": 3.0, "D": 4.0}
+
+    arbejdssæt.fasthold[:] = ""
+    assert find_fastholdte(arbejdssæt, kontrol=True) == {}
+    assert find_fastholdte(arbejdssæt, kontrol=False) == {}
+
+
+def test_skriv_gama_inputfil(tmp_path, monkeypatch):
+    """Slukkede observationer udelades - også selvom de ikke kan beregnes"""
+    observationer = pd.DataFrame({søjle: [None] * 3 for søjle in OBS_FELTER})
+    observationer["Journal"] = ["J1", "J2", "J3"]
+    observationer["Sluk"] = ["", "x", ""]
+    observationer["Fra"] = ["A", "B", "C"]
+    observationer["Til"] = ["B", "C", "A"]
+    observationer["ΔH"] = [1.5, -0.5, -1.0]
+    observationer["L"] = [500.0, 10.0, 1000.0]
+    observationer["Opst"] = [3, 1, 1]
+    observationer["σ"] = [0.6, 0.6, 2.0]
+    observationer["δ"] = [0.01, 0.01, 0.0]
+    observationer["Type"] = ["MGL", "ukendt", "mtl"]
+
+    monkeypatch.chdir(tmp_path)
+    skriv_gama_inputfil(
+        "prøve", {"A": 10.0}, ("B", "C"), obs_til_dataklasse(observationer)
+    )
+    gamafil = (tmp_path / "prøve.xml").read_text(encoding="utf-8")
+
+    assert "Nivellementsprojekt 'pr\\xf8ve'" in gamafil
+    assert "<point fix='Z' id='A' z='10.0'/>" in gamafil
+    assert "<point adj='z' id='B'/>" in gamafil
+    assert "<point adj='z' id='C'/>" in gamafil
+    assert gamafil.count("<dh ") == 2
+    assert (
+        "<dh from='A' to='B' val='+1.500000' dist='500.00000' stdev='0.42462' "
+        "extern='J1'/>"
+    ) in gamafil
+    assert (
+        "<dh from='C' to='A' val='-1.000000' dist='1000.00000' stdev='2.00000' "
+        "extern='J3'/>"
+    ) in gamafil
+    assert "J2" not in gamafil
+    assert gamafil.endswith(
+        "</height-differences>\n</points-observations>\n</network>\n</gama-local>\n"
+    )